@@ -0,0 +1,63 @@
+#! python3
+
+"""Micro benchmarks. Usage::
+
+    python benchmark.py [name ...]
+
+Run all benchmarks if no name is given.
+"""
+
+import sys
+import threading
+import time
+import tracemalloc
+
+BENCHMARKS = {}
+
+def benchmark(f):
+    BENCHMARKS[f.__name__] = f
+    return f
+
+def blocked_worker():
+    """Create a running worker which doesn't consume its event queue until
+    the returned callback is called.
+    """
+    from worker import Worker
+    release = threading.Event()
+    thread = Worker(release.wait).start()
+    def done():
+        release.set()
+        thread.stop().join()
+    return thread, done
+
+@benchmark
+def event_memory(n=100000):
+    """Bytes per queued event."""
+    thread, done = blocked_worker()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(n):
+        thread.fire("BENCH", i)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    done()
+    return "{:.1f} bytes/event".format((after - before) / n)
+
+@benchmark
+def fire_throughput(n=200000):
+    """Fires per second into a single worker."""
+    thread, done = blocked_worker()
+    fire = thread.fire
+    start = time.perf_counter()
+    for i in range(n):
+        fire("BENCH", i)
+    elapsed = time.perf_counter() - start
+    done()
+    return "{:.0f} fires/s".format(n / elapsed)
+
+def main(names):
+    for name in names or BENCHMARKS:
+        print("{}: {}".format(name, BENCHMARKS[name]()))
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -11,7 +11,7 @@ def readme():
 
 cute(
     pkg_name = 'worker',
-    lint = 'pylint worker cute docs/conf.py setup test',
+    lint = 'pylint worker cute docs/conf.py setup test benchmark',
     test = ['lint', 'coverage run --source worker -m unittest', 'readme_build'],
     bump_pre = 'test',
     bump_post = ['dist', 'release', 'publish', 'install'],
@@ -34,5 +34,6 @@ cute(
 	],
 	readme_pre = "readme_build",
 	readme = readme,
-    doc = 'sphinx-autobuild -B -z worker docs docs/build'
+    doc = 'sphinx-autobuild -B -z worker docs docs/build',
+    bench = 'python benchmark.py'
 )
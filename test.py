@@ -198,7 +198,12 @@ class TestWorker(unittest.TestCase):
         })
         
         a.stop().join()
-        
+
+        with self.subTest("event names are interned"):
+            from worker import Event
+            name = "".join(["MY_", "EVENT"])
+            self.assertIs(Event(name).name, "MY_EVENT")
+
     def test_listener(self):
         from worker import listen, create_worker, wait_forever, Worker
     
@@ -263,7 +268,55 @@ class TestWorker(unittest.TestCase):
             time.sleep(0.5)
             self.assertEqual(a, 2)
             thread.stop().join()
-            
+
+        with self.subTest("target"):
+            access = []
+            thread = Worker().start()
+            a, b = Worker(), Worker()
+            @thread.listen("COUNT", target=a, priority=1)
+            def _(event):
+                access.append("a")
+            @thread.listen("COUNT", target=b, priority=-1)
+            def _(event):
+                access.append("b")
+            @thread.listen("COUNT")
+            def _(event):
+                access.append("any")
+            thread.fire("COUNT", target=a)
+            thread.fire("COUNT", target=b)
+            thread.stop().join()
+            self.assertEqual(access, ["a", "any", "any", "b"])
+
+    def test_fire_batch(self):
+        from worker import Worker, Event, current, update
+        access = []
+        thread = Worker()
+
+        @thread.listen("ADD")
+        def _(event):
+            access.append((event.data, event.target))
+
+        thread.start()
+        thread.fire_batch(
+            [("ADD", i) for i in range(1000)] + [Event("ADD", "end")]
+        ).stop().join()
+
+        self.assertEqual([data for data, _target in access],
+            list(range(1000)) + ["end"])
+        self.assertTrue(all(target is current() for _data, target in access))
+
+        with self.subTest("events after stop_on are kept"):
+            access = []
+            @current().listen("ADD")
+            def handler(event):
+                access.append(event.data)
+            current().fire_batch([("ADD", 1), ("DONE",), ("ADD", 2)])
+            current().wait_event("DONE")
+            self.assertEqual(access, [1])
+            update()
+            self.assertEqual(access, [1, 2])
+            current().unlisten(handler)
+
     def test_overlay(self):
         """Use start_overlay to start worker on current thread"""
         from worker import Worker, is_main
@@ -364,9 +417,15 @@ class TestWorker(unittest.TestCase):
             register(i, p)
             
         thread.fire("MY_EVENT").stop().join()
-        
+
         self.assertEqual(access, [1, 2, 4, 0, 3])
-        
+
+        with self.subTest("remove keeps the order"):
+            access = []
+            thread.unlisten(thread.listeners["MY_EVENT"][1].callback)
+            thread.start().fire("MY_EVENT").stop().join()
+            self.assertEqual(access, [1, 4, 0, 3])
+
     def test_later(self):
         from worker import current, later, sleep
         
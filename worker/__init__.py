@@ -1,12 +1,12 @@
 #! python3
 
-import threading
+import threading, sys
 from threading import RLock, Lock, Thread
-import traceback, time, weakref
+import traceback, time, weakref, itertools
+from bisect import bisect_left
 from contextlib import suppress
 from collections import deque
 from functools import wraps
-import queue
 
 __version__ = "0.9.0"
 
@@ -19,12 +19,22 @@ SHORTCUTS = (
     "parent_fire", "children_fire", "bubble", "broadcast"
 )
 
+def intern(name):
+    """Intern the event name so dict lookups and comparisons of event names
+    can short-circuit on identity.
+    """
+    if type(name) is str: # pylint: disable=unidiomatic-typecheck
+        return sys.intern(name)
+    return name
+
 class WorkerExit(BaseException):
     """Raise this error to exit the thread."""
     pass
 
 class Event:
     """Event data class."""
+    __slots__ = ("name", "data", "target", "bubble", "broadcast")
+    
     def __init__(self, name, data=None, *, bubble=False, broadcast=False,
             target=None):
         """        
@@ -37,7 +47,7 @@ class Event:
         :param Worker target: Event target. If none then set to the thread
             calling :class:`Worker.fire`.
         """
-        self.name = name
+        self.name = intern(name)
         self.data = data
         self.target = target
         self.bubble = bubble
@@ -45,6 +55,11 @@ class Event:
 
 class Listener:
     """Listener data class."""
+    __slots__ = (
+        "callback", "event_name", "once", "permanent", "target", "priority",
+        "order"
+    )
+    
     def __init__(
         self, callback, event_name, *, target=None, priority=0, once=False,
         permanent=True
@@ -62,12 +77,50 @@ class Listener:
             non-permanent listeners.
         """
         self.callback = callback
-        self.event_name = event_name
+        self.event_name = intern(event_name)
         self.once = once
         self.permanent = permanent
         self.target = target
         self.priority = priority
+        self.order = None
+        
+class EventQueue:
+    """Event queue. Unlike :class:`queue.Queue`, the consumer takes all ready
+    events in one locked operation.
+    """
+    def __init__(self):
+        self.events = deque()
+        self.cond = threading.Condition(Lock())
+        
+    def put(self, event):
+        with self.cond:
+            self.events.append(event)
+            self.cond.notify()
+            
+    def put_many(self, events):
+        """Put multiple events with one lock acquisition and one wakeup."""
+        with self.cond:
+            self.events.extend(events)
+            self.cond.notify()
+            
+    def get_all(self, timeout=None):
+        """Take all events from the queue.
         
+        :arg float timeout: If None, block until there are some events. If
+            ``timeout <= 0``, don't block.
+        :return: A :class:`collections.deque` of events. It is empty if no
+            event arrives in ``timeout`` seconds.
+        """
+        with self.cond:
+            if not self.events and (timeout is None or timeout > 0):
+                self.cond.wait_for(lambda: self.events, timeout)
+            events = self.events
+            self.events = deque()
+            return events
+            
+    def __len__(self):
+        return len(self.events)
+
 def callback_deco_meth(f):
     """Make method which accept a callback be able to used as a decorator.
     """
@@ -80,21 +133,68 @@ def callback_deco_meth(f):
         return wrapped
     return wrapped
         
+def insert_sorted(table, keys, key, listener):
+    """Insert ``listener`` into the sorted tuple ``table[key]``. ``keys[key]``
+    holds the matching list of :attr:`Listener.order` for bisecting.
+    """
+    orders = keys.setdefault(key, [])
+    i = bisect_left(orders, listener.order)
+    orders.insert(i, listener.order)
+    listeners = table.get(key, ())
+    table[key] = listeners[:i] + (listener,) + listeners[i:]
+    
+def remove_sorted(table, keys, key, listener):
+    """Remove ``listener`` from the sorted tuple ``table[key]``. Empty entries
+    are deleted.
+    """
+    orders = keys.get(key, ())
+    i = bisect_left(orders, listener.order)
+    if i == len(orders) or orders[i] != listener.order:
+        raise ValueError("listener is not registered")
+    del orders[i]
+    if orders:
+        listeners = table[key]
+        table[key] = listeners[:i] + listeners[i + 1:]
+    else:
+        del table[key]
+        del keys[key]
+        
+def listener_order(listener):
+    return listener.order
+        
 class EventEmitter:
     """Basic event emitter."""
     def __init__(self):
+        # event name -> immutable tuple of listeners sorted by priority. The
+        # tuple is replaced, never mutated, so it is safe to iterate without
+        # copying.
         self.listeners = {}
+        # (event name, target) -> sorted tuple of listeners which only match
+        # the target. Untargeted listeners are stored under target None.
+        self.listener_index = {}
+        # sorted lists of listener.order for the tables above, used to bisect.
+        self.listener_keys = {}
+        self.index_keys = {}
+        # event name -> {target: merged tuple of untargeted and targeted
+        # listeners}
+        self.dispatch_cache = {}
         self.listener_pool = {}
+        self.listener_lock = Lock()
+        self.listener_count = itertools.count()
         self.event_que = None
+        # events taken from event_que but not processed yet
+        self.ready_events = None
         self.que_lock = RLock()
         
     def init(self):
         with self.que_lock:
-            self.event_que = queue.Queue()
+            self.event_que = EventQueue()
+            self.ready_events = deque()
         
     def uninit(self):
         with self.que_lock:
             self.event_que = None
+            self.ready_events = None
         
     @callback_deco_meth
     def listen(self, callback, *args, **kwargs):
@@ -110,29 +210,84 @@ class EventEmitter:
                 # handle event...
         """
         listener = Listener(callback, *args, **kwargs)
-
-        listeners = self.listeners.setdefault(listener.event_name, [])
-        i = 0
-        for t_listener in listeners:
-            if t_listener.priority < listener.priority:
-                break
-            i += 1
-        listeners.insert(i, listener)
-
-        self.listener_pool.setdefault(callback, []).append(listener)
+        with self.listener_lock:
+            self.add_listener(listener)
+            self.listener_pool.setdefault(callback, {})[listener] = None
         return callback
 
     def unlisten(self, callback):
         """Unlisten a callback"""
-        for listener in self.listener_pool[callback]:
-            self.listeners[listener.event_name].remove(listener)
-        del self.listener_pool[callback]
+        with self.listener_lock:
+            for listener in self.listener_pool.pop(callback):
+                self.drop_listener(listener)
         
     def remove_listener(self, listener):
-        self.listeners[listener.event_name].remove(listener)
-        self.listener_pool[listener.callback].remove(listener)
-        if not self.listener_pool[listener.callback]:
-            del self.listener_pool[listener.callback]
+        with self.listener_lock:
+            self.drop_listener(listener)
+            listeners = self.listener_pool[listener.callback]
+            del listeners[listener]
+            if not listeners:
+                del self.listener_pool[listener.callback]
+                
+    def add_listener(self, listener):
+        """Insert the listener into the dispatch tables. The caller must hold
+        :attr:`listener_lock`.
+        
+        Listeners are ordered by ``(-priority, insertion order)`` so listeners
+        with the same priority are called in the order they are registered.
+        """
+        name = listener.event_name
+        target = listener.target or None
+        listener.order = (-listener.priority, next(self.listener_count))
+        insert_sorted(self.listeners, self.listener_keys, name, listener)
+        insert_sorted(
+            self.listener_index, self.index_keys, (name, target), listener)
+        self.invalidate_dispatch(name, target)
+        
+    def drop_listener(self, listener):
+        """Remove the listener from the dispatch tables. The caller must hold
+        :attr:`listener_lock`.
+        """
+        name = listener.event_name
+        target = listener.target or None
+        remove_sorted(self.listeners, self.listener_keys, name, listener)
+        remove_sorted(
+            self.listener_index, self.index_keys, (name, target), listener)
+        self.invalidate_dispatch(name, target)
+        
+    def invalidate_dispatch(self, name, target):
+        if target is None:
+            self.dispatch_cache.pop(name, None)
+        else:
+            with suppress(KeyError):
+                del self.dispatch_cache[name][target]
+                
+    def get_listeners(self, name, target):
+        """Return the listeners matching ``name`` and ``target``, sorted by
+        priority.
+        
+        Only the untargeted bucket and the bucket of ``target`` are visited.
+        If ``target`` has its own bucket, the merged tuple is cached until a
+        listener of either bucket changes.
+        """
+        untargeted = self.listener_index.get((name, None), ())
+        if target is None or (name, target) not in self.listener_index:
+            return untargeted
+        with suppress(KeyError):
+            return self.dispatch_cache[name][target]
+        with self.listener_lock:
+            # re-read the buckets inside the lock so we never cache a merge
+            # of stale buckets.
+            cache = self.dispatch_cache.setdefault(name, {})
+            listeners = cache.get(target)
+            if listeners is None:
+                listeners = tuple(sorted(
+                    self.listener_index.get((name, None), ()) +
+                    self.listener_index.get((name, target), ()),
+                    key=listener_order
+                ))
+                cache[target] = listeners
+            return listeners
 
     def que_event(self, event):
         """Que the event"""
@@ -140,15 +295,24 @@ class EventEmitter:
             with self.que_lock:
                 self.event_que.put(event)
         except AttributeError:
-            if event.target and event.target is not self:
-                event.target.fire("EVENT_REJECT", data=(event, self))
+            self.reject_event(event)
+            
+    def que_events(self, events):
+        """Que multiple events at once"""
+        try:
+            with self.que_lock:
+                self.event_que.put_many(events)
+        except AttributeError:
+            for event in events:
+                self.reject_event(event)
+                
+    def reject_event(self, event):
+        if event.target and event.target is not self:
+            event.target.fire("EVENT_REJECT", data=(event, self))
 
     def process_event(self, event):
         """Deliver the event to listeners."""
-        listeners = self.listeners.get(event.name, ())
-        for listener in listeners[:]:
-            if listener.target and listener.target is not event.target:
-                continue
+        for listener in self.get_listeners(event.name, event.target):
             try:
                 listener.callback(event)
             except Exception as err: # pylint: disable=broad-except
@@ -161,21 +325,59 @@ class EventEmitter:
         print("Error occurred in listener:")
         traceback.print_exc()
         
-    def fire(self, event, *args, **kwargs):
+    def fire(self, event, data=None, **kwargs):
         """Put an event to the event queue.
         
         :arg event: If ``event`` is not an instance of :class:`Event`, it would
             be converted into an :class:`Event` object::
             
-                event = Event(event, *args, **kwargs)
+                event = Event(event, data, **kwargs)
         """
         if not isinstance(event, Event):
-            event = Event(event, *args, **kwargs)
+            if kwargs:
+                event = Event(event, data, **kwargs)
+            else:
+                event = Event(event, data)
         if not event.target:
             event.target = current()
         self.que_event(event)
         return self
         
+    def fire_batch(self, events):
+        """Put multiple events to the event queue with one lock acquisition
+        and one wakeup.
+        
+        :arg events: An iterable. Each item is an :class:`Event`, an event
+            name, or a tuple of arguments that would be sent to
+            :class:`Event`.
+        """
+        batch = []
+        target = None
+        for event in events:
+            if not isinstance(event, Event):
+                if isinstance(event, str):
+                    event = Event(event)
+                else:
+                    event = Event(*event)
+            if not event.target:
+                if target is None:
+                    target = current()
+                event.target = target
+            batch.append(event)
+        if batch:
+            self.que_events(batch)
+        return self
+        
+    def next_event(self, timeout=None):
+        """Return the next ready event, or None if time's up. Events are taken
+        from :attr:`event_que` in batches.
+        """
+        if not self.ready_events:
+            self.ready_events = self.event_que.get_all(timeout)
+            if not self.ready_events:
+                return None
+        return self.ready_events.popleft()
+        
     def event_loop(self, timeout=None, stop_on=None): # pylint: disable=inconsistent-return-statements
         """Do event loop."""
         if timeout:
@@ -184,9 +386,8 @@ class EventEmitter:
             end_time = None
             
         while timeout is None or timeout > 0:
-            try:
-                event = self.event_que.get(timeout=timeout)
-            except queue.Empty:
+            event = self.next_event(timeout)
+            if event is None:
                 # timeup
                 return
                 
@@ -218,9 +419,8 @@ class EventEmitter:
             root.mainloop()
         """
         while True:
-            try:
-                event = self.event_que.get_nowait()
-            except queue.Empty:
+            event = self.next_event(0)
+            if event is None:
                 break
             self.process_event(event)
             
@@ -279,6 +479,11 @@ class EventTree(CachedEventEmitter):
         super().que_event(event)
         self.transfer_event(event)
         
+    def que_events(self, events):
+        super().que_events(events)
+        for event in events:
+            self.transfer_event(event)
+        
     def transfer_event(self, event):
         """Bubble or broadcast event"""
         if event.bubble:
@@ -486,6 +691,7 @@ class Worker(EventTree):
         with self.que_lock:
             # cache some data for later use
             event_que = self.event_que
+            ready_events = self.ready_events
             native_thread = self.thread
 
             # mark thread as end
@@ -494,11 +700,12 @@ class Worker(EventTree):
 
         # cleanup queue
         while True:
+            if not ready_events:
+                ready_events = event_que.get_all(0)
+                if not ready_events:
+                    break
             try:
-                event = event_que.get_nowait()
-                self.process_event(event)
-            except queue.Empty:
-                break
+                self.process_event(ready_events.popleft())
             except WorkerExit:
                 pass
             except BaseException:
@@ -507,7 +714,7 @@ class Worker(EventTree):
                 
         # cleanup non-permanent listeners
         for listeners in list(self.listeners.values()):
-            for listener in listeners[:]:
+            for listener in listeners:
                 if not listener.permanent:
                     self.remove_listener(listener)
 